@@ -5,8 +5,16 @@ Usage: python gen_script.py <json_dir> <c_scan_dir> <output_header.h>
 """
 import os
 import json
+import struct
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # orjson parses straight from bytes, several times faster than stdlib json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # -----------------------------------------------------------------------------
 # Define all your PDR field types and order here in code. Do NOT generate C structs;
@@ -41,17 +49,44 @@ FIELD_TYPES = {
 
 # -----------------------------------------------------------------------------
 
+def iter_files(root_dir, suffixes):
+    """Yield paths of all files under root_dir whose names end with suffixes.
+
+    scandir-based walk: one syscall per directory and no per-entry stat(),
+    unlike os.walk.
+    """
+    stack = [root_dir]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    yield entry.path
+
+
+def _read_and_parse(path):
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
 def load_json_records(json_dir):
-    """Load all JSON PDR definitions as (record_dict, basename, index) tuples."""
+    """Load all JSON PDR definitions as (record_dict, basename, index) tuples.
+
+    Reads and parses files on a thread pool — the GIL is released during
+    read() (and orjson parse), so cold-cache loads of many small files scale
+    with I/O latency. The appending loop stays on the main thread so record
+    order follows the path order.
+    """
     records = []
-    for root, _, files in os.walk(json_dir):
-        for fname in files:
-            if not fname.endswith('.json'):
-                continue
-            path = os.path.join(root, fname)
-            with open(path, 'r') as f:
-                data = json.load(f)
-            base = os.path.splitext(fname)[0]
+    paths = list(iter_files(json_dir, ('.json',)))
+    if not paths:
+        return records
+    workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for path, data in zip(paths, ex.map(_read_and_parse, paths)):
+            base = os.path.splitext(os.path.basename(path))[0]
             if isinstance(data, list):
                 for idx, rec in enumerate(data):
                     records.append((rec, base, idx))
@@ -62,25 +97,66 @@ def load_json_records(json_dir):
 
 def has_pdr_use(c_dir):
     """Scan C sources for the PDR_USE marker."""
-    for root, _, files in os.walk(c_dir):
-        for fname in files:
-            if not (fname.endswith('.c') or fname.endswith('.h')):
-                continue
-            path = os.path.join(root, fname)
-            with open(path, 'r', errors='ignore') as f:
-                if '#define PDR_USE' in f.read():
-                    return True
+    # Binary read: the bytes substring check needs no UTF-8 decode pass
+    for path in iter_files(c_dir, ('.c', '.h')):
+        with open(path, 'rb') as f:
+            if b'#define PDR_USE' in f.read():
+                return True
     return False
 
 
+# Prebuilt little-endian packers (one C call per value) and per-byte sizes.
+_TYPE_FMT = {'uint8': 'B', 'uint16': 'H', 'uint32': 'I'}
+_TYPE_SIZES = {'uint8': 1, 'uint16': 2, 'uint32': 4}
+_PACKERS = {t: struct.Struct('<' + c).pack for t, c in _TYPE_FMT.items()}
+
+try:
+    # Optional JIT fast path: pack integer columns (SoA) with a compiled
+    # kernel when numba/numpy are installed; otherwise the plain path runs.
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+else:
+    @njit(cache=True)
+    def _pack_le(out, offsets, cols, sizes):
+        """Write each record's integer columns little-endian into out."""
+        for r in range(offsets.size):
+            off = offsets[r]
+            for f in range(sizes.size):
+                v = cols[f, r]
+                for b in range(sizes[f]):
+                    out[off] = (v >> (8 * b)) & 0xFF
+                    off += 1
+
+
+def _compile_layouts():
+    """Precompile one struct.Struct for the fixed-field prefix of each PDR type.
+
+    Packing the whole integer prefix with a single Struct.pack call replaces
+    one pack_field dispatch per field; the variable-length tail (strings) is
+    packed per field as before.
+    """
+    layouts = {}
+    for pdr_type, fields in FIELD_TYPES.items():
+        fixed = []
+        for name, ftype in fields:
+            if ftype not in _TYPE_FMT:
+                break
+            fixed.append((name, ftype))
+        fmt = '<' + ''.join(_TYPE_FMT[ftype] for _, ftype in fixed)
+        names = tuple(name for name, _ in fixed)
+        layouts[pdr_type] = (names, struct.Struct(fmt), fields[len(fixed):])
+    return layouts
+
+_LAYOUTS = _compile_layouts()
+
+
 def pack_field(value, ftype):
     """Convert a field value to little-endian bytes based on its type."""
-    if ftype == 'uint8':
-        return int(value).to_bytes(1, 'little')
-    if ftype == 'uint16':
-        return int(value).to_bytes(2, 'little')
-    if ftype == 'uint32':
-        return int(value).to_bytes(4, 'little')
+    packer = _PACKERS.get(ftype)
+    if packer is not None:
+        return packer(int(value))
     if ftype == 'strUTF8':
         s = str(value).encode('utf-8')
         return s + b'\x00'
@@ -89,6 +165,9 @@ def pack_field(value, ftype):
 
 def build_blob_and_index(records):
     """Build the binary blob and index entries from JSON records."""
+    if np is not None and records:
+        return _build_blob_and_index_soa(records)
+
     blob = bytearray()
     index = []  # list of (record_handle, offset)
     # Track per-record offsets for macro generation
@@ -99,11 +178,18 @@ def build_blob_and_index(records):
         pdr_type = rec.get('pdr_type')
         if pdr_type not in FIELD_TYPES:
             raise ValueError(f"Unknown pdr_type '{pdr_type}' in {base}.json")
-        # Pack each field in order
         for fname, ftype in FIELD_TYPES[pdr_type]:
             if fname not in rec:
                 raise KeyError(f"Missing field '{fname}' for record '{base}_{idx}'")
-            blob.extend(pack_field(rec[fname], ftype))
+        # One preallocated buffer per record: pack_into writes the fixed
+        # prefix in place and the string tail is spliced behind it, so the
+        # blob grows by a single extend per record.
+        fixed_names, prefix_struct, tail = _LAYOUTS[pdr_type]
+        tail_bytes = b''.join(pack_field(rec[fname], ftype) for fname, ftype in tail)
+        buf = bytearray(prefix_struct.size + len(tail_bytes))
+        prefix_struct.pack_into(buf, 0, *(int(rec[n]) for n in fixed_names))
+        buf[prefix_struct.size:] = tail_bytes
+        blob.extend(buf)
         # Record the handle and offset
         handle = rec.get('recordHandle')
         index.append((handle, offset))
@@ -112,20 +198,79 @@ def build_blob_and_index(records):
     return blob, index, offsets
 
 
-def format_blob(blob):
-    """Return C initializer list for the blob (hex bytes, 12 per line)."""
-    lines = []
-    for i in range(0, len(blob), 12):
-        chunk = blob[i:i+12]
-        line = ', '.join(f'0x{b:02X}' for b in chunk)
-        lines.append('    ' + line)
-    return ',
-'.join(lines)
+def _build_blob_and_index_soa(records):
+    """JIT variant of build_blob_and_index: columns-of-ints packed by _pack_le.
+
+    Pass 1 walks the records in order, assigning offsets and encoding the
+    variable string tails; pass 2 gathers the fixed integer fields of each
+    PDR type into a column array and lets the compiled kernel write them
+    little-endian into the preallocated blob. Output is identical to the
+    pure-Python path.
+    """
+    index = []
+    offsets = []
+    rec_offsets = []
+    tail_blobs = []  # (tail_offset, encoded bytes)
+    by_type = {}
+    total = 0
+
+    for pos, (rec, base, idx) in enumerate(records):
+        pdr_type = rec.get('pdr_type')
+        if pdr_type not in FIELD_TYPES:
+            raise ValueError(f"Unknown pdr_type '{pdr_type}' in {base}.json")
+        for fname, ftype in FIELD_TYPES[pdr_type]:
+            if fname not in rec:
+                raise KeyError(f"Missing field '{fname}' for record '{base}_{idx}'")
+        fixed_names, prefix_struct, tail = _LAYOUTS[pdr_type]
+        tail_bytes = b''.join(pack_field(rec[fname], ftype) for fname, ftype in tail)
+        index.append((rec.get('recordHandle'), total))
+        offsets.append((base, idx, pdr_type, total))
+        rec_offsets.append(total)
+        tail_blobs.append((total + prefix_struct.size, tail_bytes))
+        by_type.setdefault(pdr_type, []).append(pos)
+        total += prefix_struct.size + len(tail_bytes)
+
+    out = np.zeros(total, dtype=np.uint8)
+    for pdr_type, positions in by_type.items():
+        fixed_names = _LAYOUTS[pdr_type][0]
+        field_types = dict(FIELD_TYPES[pdr_type])
+        sizes = np.array([_TYPE_SIZES[field_types[n]] for n in fixed_names],
+                         dtype=np.int64)
+        cols = np.empty((len(fixed_names), len(positions)), dtype=np.int64)
+        for f, fname in enumerate(fixed_names):
+            col = cols[f]
+            for r, pos in enumerate(positions):
+                col[r] = int(records[pos][0][fname])
+        offs = np.array([rec_offsets[pos] for pos in positions], dtype=np.int64)
+        _pack_le(out, offs, cols, sizes)
+
+    blob = bytearray(out.tobytes())
+    for tail_offset, tail_bytes in tail_blobs:
+        if tail_bytes:
+            blob[tail_offset:tail_offset + len(tail_bytes)] = tail_bytes
+    return blob, index, offsets
+
+
+def write_blob(hdr, blob):
+    """Write the blob as concatenated C string literals (16 bytes per line).
+
+    A "\\xAB..." literal is ~3 chars per byte versus ~6 tokens for a
+    0xAB, ... initializer list: half the bytes to write here and far fewer
+    tokens for the C compiler to chew through later. Streams directly into
+    the open handle from one bytes.hex() pass.
+    """
+    hx = blob.hex().upper()
+    if not hx:
+        hdr.write('    ""\n')
+        return
+    for i in range(0, len(hx), 32):
+        chunk = hx[i:i + 32]
+        hdr.write('    "\\x' + '\\x'.join(chunk[j:j + 2] for j in range(0, len(chunk), 2)) + '"\n')
 
 
 def generate_header(records, blob, index, offsets, out_path):
     """Generate the C header with blob, index, and access macros."""
-    with open(out_path, 'w') as hdr:
+    with open(out_path, 'w', buffering=1 << 20) as hdr:
         hdr.write('#pragma once\n')
         hdr.write('#ifdef PDR_USE\n\n')
         hdr.write('#include <stdint.h>\n#include <stddef.h>\n\n')
@@ -135,9 +280,11 @@ def generate_header(records, blob, index, offsets, out_path):
 
         # Blob
         hdr.write('__attribute__((section(".pdr_data")))\n')
-        hdr.write('static const uint8_t pdr_blob[] = {\n')
-        hdr.write(format_blob(blob) + '\n');
-        hdr.write('};\n\n')
+        # Explicit array size: the string literal's implicit NUL terminator
+        # is dropped, so sizeof(pdr_blob) still equals the blob length.
+        hdr.write(f'static const uint8_t pdr_blob[{len(blob)}] =\n')
+        write_blob(hdr, blob)
+        hdr.write(';\n\n')
 
         # Blob size
         hdr.write('static const size_t pdr_blob_size = sizeof(pdr_blob);\n\n')
@@ -158,8 +305,7 @@ def generate_header(records, blob, index, offsets, out_path):
             hdr.write(f'#define {name}_offset ({offset})\n')
             # field macros
             for fname, _ in FIELD_TYPES[pdr_type]:
-                hdr.write(f'#define {name}_{fname} \\
-')
+                hdr.write(f'#define {name}_{fname} \\\n')
                 hdr.write(f'    ((({pdr_type}*)(pdr_blob + {name}_offset))->')
                 hdr.write(f'{fname})\n')
             hdr.write('\n')
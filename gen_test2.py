@@ -1,14 +1,24 @@
 import json
 import os
+import re
+import sys
 from docutils import nodes
 from docutils.statemachine import ViewList
 from sphinx.util.nodes import nested_parse_with_titles
 
+# Comments containing any of these need real RST parsing; everything else can
+# go straight into a paragraph node.
+_RST_HINT = re.compile(r'[`*_:|]|^\s*\.\.')
+
 class PDRField:
     """Represents a field within a PDR, handling both simple fields and nested structs."""
+    # No per-instance __dict__: these are created en masse during doc builds
+    __slots__ = ('name', 'type', 'fields', 'comment', 'value')
+
     def __init__(self, field_dict):
         self.name = field_dict['name']
-        self.type = field_dict['type']
+        # Interned so type comparisons reduce to pointer checks
+        self.type = sys.intern(field_dict['type'])
         self.fields = [PDRField(sub_field) for sub_field in field_dict.get('fields', [])]
         self.comment = field_dict.get('comment', "No comment provided.")
         if 'computed' in field_dict and field_dict['computed']:
@@ -30,11 +40,14 @@ class PDRField:
 
 class PDRDefinition:
     """Represents a PDR definition, including its type, description, and fields."""
+    __slots__ = ('pdr_type', 'pdr_type_value', 'description', 'fields', '_leaf_fields')
+
     def __init__(self, pdr_dict):
         self.pdr_type = pdr_dict['pdr_type']
         self.pdr_type_value = pdr_dict['pdr_type_value']
         self.description = pdr_dict['description']
         self.fields = [PDRField(field) for field in pdr_dict['fields']]
+        self._leaf_fields = None  # flattened lazily, then reused
 
     def to_sphinx_table(self, state, parent):
         """Generate Sphinx table nodes for this PDR definition."""
@@ -68,19 +81,28 @@ class PDRDefinition:
                 entry = nodes.entry()
                 entry += nodes.paragraph(text=text)
                 row += entry
-            # Comment cell with RST parsing
+            # Comment cell: only pay for RST parsing when markup is present
             comment_entry = nodes.entry()
-            viewlist = ViewList()
-            viewlist.append(field.comment, '<generated>')
-            nested_parse_with_titles(state, viewlist, comment_entry)
+            if _RST_HINT.search(field.comment):
+                viewlist = ViewList()
+                viewlist.append(field.comment, '<generated>')
+                nested_parse_with_titles(state, viewlist, comment_entry)
+            else:
+                comment_entry += nodes.paragraph(text=field.comment)
             row += comment_entry
             tbody += row
         parent += table
 
     def get_all_fields(self):
-        """Get all leaf fields from the PDR, including those in nested structs."""
-        for field in self.fields:
-            yield from field.get_leaf_fields()
+        """Get all leaf fields from the PDR, including those in nested structs.
+
+        The flattened list is computed once and cached; re-walking the nested
+        struct tree per render was quadratic in nesting depth.
+        """
+        if self._leaf_fields is None:
+            self._leaf_fields = [leaf for field in self.fields
+                                 for leaf in field.get_leaf_fields()]
+        return self._leaf_fields
 
 def pdr_directive(name, arguments, options, content, lineno, content_offset, block_text, state, state_machine):
     """Custom directive to generate PDR tables from JSON files."""
@@ -1,22 +1,13 @@
 import subprocess
-from datetime import datetime
+from datetime import datetime, timezone
 
 def get_latest_commit_timestamp(file_path):
-    # Get the latest commit timestamp for the file
-    git_command = ['git', 'log', '-1', '--format=%cd', '--date=iso', file_path]
-    result = subprocess.run(git_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Error getting Git commit timestamp: {result.stderr}")
-    
-    # The timestamp is in ISO format, e.g., "2023-10-05 14:30:00 +0000"
-    timestamp_str = result.stdout.strip()
-    return timestamp_str
-
-def parse_timestamp(timestamp_str):
-    # Parse the timestamp string into a datetime object
-    dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S %z")
-    return dt
+    # Get the latest commit time for the file as a unix timestamp (%ct):
+    # a plain integer, so there is no locale-sensitive date string to parse
+    git_command = ['git', 'log', '-1', '--format=%ct', file_path]
+    result = subprocess.run(git_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, check=True)
+    return int(result.stdout.strip())
 
 def generate_c_header(file_path, dt):
     # Extract year, month, day, hour, minute, second
@@ -55,11 +46,9 @@ def main():
 
     try:
         # Get the latest commit timestamp
-        timestamp_str = get_latest_commit_timestamp(git_file_path)
-        
-        # Parse the timestamp
-        dt = parse_timestamp(timestamp_str)
-        
+        timestamp = get_latest_commit_timestamp(git_file_path)
+        dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
         # Generate the C header file
         generate_c_header(header_file_path, dt)
         
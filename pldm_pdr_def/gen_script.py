@@ -1,22 +1,42 @@
 import argparse
+import copy
 import yaml
 import json
 
+try:
+    # libyaml-backed parser; large speedup over the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 def generate_auto_gen(field_def):
     """
-    Recursively generate 'auto-gen' values for a field definition.
+    Generate 'auto-gen' values for a field definition.
+
+    Walks a deep copy with an explicit stack instead of recursing, replacing
+    leaf type strings (e.g. "uint16") in place.
     """
     if isinstance(field_def, str):
         # Simple field type (e.g., "uint16")
         return "auto-gen"
-    elif isinstance(field_def, dict):
-        # Nested structure (e.g., {"languageTag": "strASCII"})
-        return {k: generate_auto_gen(v) for k, v in field_def.items()}
-    elif isinstance(field_def, list):
-        # List of items (e.g., [{"languageTag": "strASCII", "name": "strUTF-16BE"}])
-        return [generate_auto_gen(item) for item in field_def]
-    else:
-        raise ValueError(f"Invalid field definition: {field_def}")
+    result = copy.deepcopy(field_def)
+    stack = [result]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            raise ValueError(f"Invalid field definition: {container}")
+        for key, value in items:
+            if isinstance(value, str):
+                container[key] = "auto-gen"
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+            else:
+                raise ValueError(f"Invalid field definition: {value}")
+    return result
 
 def generate_pdr_json(yaml_path, output_json_path):
     """
@@ -24,7 +44,7 @@ def generate_pdr_json(yaml_path, output_json_path):
     """
     # Load YAML content
     with open(yaml_path, "r") as f:
-        pdr_def = yaml.safe_load(f)
+        pdr_def = yaml.load(f, Loader=_YamlLoader)
 
     # Extract PDR type (e.g., "EntityAuxiliaryNames")
     pdr_type_key = list(pdr_def.keys())[0]
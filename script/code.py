@@ -1,9 +1,77 @@
+import io
+import os
 import sys
 import json
 import yaml
 import struct
 import jsonschema
 
+try:
+    # libyaml-backed parser; large speedup over the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson parses straight from bytes, several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: bulk hex rendering for large PDRs
+    import numpy as np
+except ImportError:
+    np = None
+
+def _json_read(path):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+# One '0xNN' token per byte value; a single numpy gather over the packed
+# buffer replaces per-byte string slicing for large arrays. Only worth the
+# frombuffer overhead above this size.
+_HEX_LUT = None if np is None else np.array([f'0x{i:02X}' for i in range(256)], dtype=object)
+_NUMPY_HEX_THRESHOLD = 64
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_hex_tokens = None
+if njit is not None and np is not None:
+    # Two hex chars per byte value, as ASCII codes
+    _HEX_CHARS = np.frombuffer(
+        ''.join(f'{i:02X}' for i in range(256)).encode('ascii'), dtype=np.uint8)
+
+    @njit(cache=True)
+    def _hex_tokens(buf, lut, out):
+        # Writes one '0xNN, ' token per byte into out (sized 6 * buf.size):
+        # two loads and six stores per byte, no interpreter in the loop
+        for i in range(buf.size):
+            b = buf[i]
+            j = i * 6
+            out[j] = 0x30      # '0'
+            out[j + 1] = 0x78  # 'x'
+            out[j + 2] = lut[2 * b]
+            out[j + 3] = lut[2 * b + 1]
+            out[j + 4] = 0x2C  # ','
+            out[j + 5] = 0x20  # ' '
+
+# Below this size the JIT dispatch outweighs the render itself
+_NUMBA_HEX_THRESHOLD = 128
+
+try:
+    # Code-generates one specialized validation function per schema, roughly
+    # an order of magnitude faster than jsonschema's generic keyword dispatch
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 # Struct format map
 TYPE_TO_FMT = {
     "uint8": "B", "sint8": "b",
@@ -13,138 +81,323 @@ TYPE_TO_FMT = {
     "real32": "f"
 }
 
-# String type handling
-STRING_HANDLERS = {
-    "strASCII":    lambda s: s.encode('iso-8859-1') + b'\x00',
-    "strUTF-8":    lambda s: s.encode('utf-8')       + b'\x00',
-    "strUTF-16":   lambda s: b'\xFF\xFE' + s.encode('utf-16le') + b'\x00\x00',  # BOM + LE + null
-    "strUTF-16LE": lambda s: s.encode('utf-16le')    + b'\x00\x00',
-    "strUTF-16BE": lambda s: s.encode('utf-16be')    + b'\x00\x00',
-}
+# Compiled Struct objects, keyed by format string. Reusing them turns the
+# per-field struct.pack calls (each of which re-parses its format) into one
+# C-level pack per run of fixed fields.
+_STRUCT_CACHE = {}
 
-def pack_string(value, string_type):
-    if not value:
-        # Empty string handling per type
-        if string_type in ["strUTF-16", "strUTF-16LE", "strUTF-16BE"]:
-            return b'\x00\x00' if string_type != "strUTF-16" else b'\xFF\xFE\x00\x00'
+def _get_struct(fmt):
+    s = _STRUCT_CACHE.get(fmt)
+    if s is None:
+        s = _STRUCT_CACHE[fmt] = struct.Struct(fmt)
+    return s
+
+# The PDR header layout never changes; compile it once
+_HDR_STRUCT = struct.Struct('<IBBHH')
+
+# Parsed schemas and their compiled validators, keyed by (path, mtime_ns) so
+# a multi-file run pays schema parsing and validator compilation once per
+# schema rather than once per YAML file; an edited schema re-keys naturally.
+_SCHEMA_CACHE = {}
+
+def _load_schema(schema_path):
+    """Return (schema, validate, plan) for schema_path, cached on path/mtime.
+
+    validate is a fastjsonschema-compiled function when that package is
+    available, otherwise the .validate method of a prebuilt jsonschema
+    validator. plan is the field plan built by _build_field_plan.
+    """
+    key = (schema_path, os.stat(schema_path).st_mtime_ns)
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is None:
+        schema = _json_read(schema_path)
+        if fastjsonschema is not None:
+            validate = fastjsonschema.compile(schema)
         else:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validate = validator_cls(schema).validate
+        cached = _SCHEMA_CACHE[key] = (schema, validate, _build_field_plan(schema))
+    return cached
+
+_VALIDATION_ERRORS = (jsonschema.exceptions.ValidationError,)
+if fastjsonschema is not None:
+    _VALIDATION_ERRORS += (fastjsonschema.JsonSchemaException,)
+
+# String types are resolved to small integer tags once per field, so the
+# per-string hot path indexes a tuple instead of dispatching through a dict
+# of lambdas and re-testing the type name.
+_STRING_TAGS = {
+    "strASCII": 0,
+    "strUTF-8": 1,
+    "strUTF-16": 2,
+    "strUTF-16LE": 3,
+    "strUTF-16BE": 4,
+}
+
+# Indexed by tag: (encoder, BOM prefix, null terminator, payload cap,
+# empty-string result). The cap is the 256-byte field limit minus the
+# terminator width, so the hot path is encode, one length check against a
+# precomputed constant, append terminator — no per-call branching on the
+# type name and the terminator keeps its full width even when truncating.
+_ENCODERS = (
+    (lambda s: s.encode('iso-8859-1'), b'',         b'\x00',     255, b'\x00'),
+    (lambda s: s.encode('utf-8'),      b'',         b'\x00',     255, b'\x00'),
+    (lambda s: s.encode('utf-16le'),   b'\xFF\xFE', b'\x00\x00', 254, b'\xFF\xFE\x00\x00'),  # BOM + LE + null
+    (lambda s: s.encode('utf-16le'),   b'',         b'\x00\x00', 254, b'\x00\x00'),
+    (lambda s: s.encode('utf-16be'),   b'',         b'\x00\x00', 254, b'\x00\x00'),
+)
+
+def pack_string(value, tag):
+    # strASCII (tag 0) dominates PDR string fields; inline it so the common
+    # case is one C-level latin-1 encode with no table unpack or lambda call
+    if tag == 0:
+        if not value:
             return b'\x00'
-    
-    encoder = STRING_HANDLERS[string_type]
-    encoded = encoder(value)
-    
-    # Enforce max length (including null terminator)
-    max_len = 256
-    if len(encoded) > max_len:
-        print(f"Warning: String '{value}' truncated to {max_len} bytes", file=sys.stderr)
-        encoded = encoded[:max_len-1] + b'\x00' if string_type.startswith("strUTF-16") else encoded[:max_len-1] + b'\x00'
-    
-    return encoded
+        body = value.encode('latin-1')
+        if len(body) > 255:
+            print(f"Warning: String '{value}' truncated to 256 bytes", file=sys.stderr)
+            body = body[:255]
+        return body + b'\x00'
 
-# ... [keep all previous functions: strip_comments, replace_tbd_and_defaults, resolve_format, etc.]
+    encoder, bom, term, cap, empty = _ENCODERS[tag]
+    if not value:
+        return empty
+
+    body = bom + encoder(value)
+    if len(body) > cap:
+        print(f"Warning: String '{value}' truncated to 256 bytes", file=sys.stderr)
+        body = body[:cap]
+
+    return body + term
 
-def generate_c_array(schema_path, yaml_path, array_name='pdr_data'):
-    with open(schema_path, 'r') as f:
-        schema = json.load(f)
-    with open(yaml_path, 'r') as f:
-        data = yaml.safe_load(f)
+def pack_string_into(staging, value, tag):
+    """Append the encoded string to the staging bytearray; return byte count.
+
+    Encodes directly into the shared backing buffer so the string path never
+    creates a per-field bytes object; callers record (offset, length) and
+    splice with a memoryview later.
+    """
+    if tag == 0:
+        if not value:
+            staging += b'\x00'
+            return 1
+        body = value.encode('latin-1')
+        if len(body) > 255:
+            print(f"Warning: String '{value}' truncated to 256 bytes", file=sys.stderr)
+            body = body[:255]
+        staging += body
+        staging += b'\x00'
+        return len(body) + 1
+
+    encoder, bom, term, cap, empty = _ENCODERS[tag]
+    if not value:
+        staging += empty
+        return len(empty)
 
-    plain_data = strip_comments(data)
-    plain_data = replace_tbd_and_defaults(plain_data, schema)
+    start = len(staging)
+    staging += bom
+    staging += encoder(value)
+    if len(staging) - start > cap:
+        print(f"Warning: String '{value}' truncated to 256 bytes", file=sys.stderr)
+        del staging[start + cap:]
+    staging += term
 
-    try:
-        jsonschema.validate(instance=plain_data, schema=schema)
-    except jsonschema.exceptions.ValidationError as e:
-        raise ValueError(f"Validation failed for {yaml_path}: {e}")
+    return len(staging) - start
 
-    data_format = '<'
-    data_values = []
+# Field-plan kinds
+_KIND_FIXED, _KIND_STRING, _KIND_RANGE = range(3)
+
+def _build_field_plan(schema):
+    """Pre-resolve the binaryOrder walk into a list of (name, kind, payload).
+
+    The property lookups, stringType tests and tag resolution depend only on
+    the schema, so they run once here; the per-file loop then just dispatches
+    on the kind integer. payload is the string tag for _KIND_STRING, the
+    property dict for _KIND_FIXED, and (format char, trailing (name, prop)
+    pairs) for _KIND_RANGE, which consumes the rest of binaryOrder.
+    """
     binary_order = schema.get("binaryOrder", [])
     properties = schema["properties"]
-
-    i = 0
-    while i < len(binary_order):
-        field_name = binary_order[i]
+    plan = []
+    for i, field_name in enumerate(binary_order):
         if field_name == "pdrHeader":
-            i += 1
             continue
-
         prop = properties.get(field_name)
         if not prop:
             raise ValueError(f"Missing schema property: {field_name}")
+        if "stringType" in prop:
+            plan.append((field_name, _KIND_STRING, _STRING_TAGS[prop["stringType"]]))
+        elif field_name == "rangeFieldSupport":
+            tail = tuple((rf, properties.get(rf)) for rf in binary_order[i + 1:])
+            plan.append((field_name, _KIND_RANGE, (prop["binaryFormat"], tail)))
+            break
+        else:
+            plan.append((field_name, _KIND_FIXED, prop))
+    return plan
 
-        value = plain_data.get(field_name)
+# ... [keep all previous functions: strip_comments, replace_tbd_and_defaults, resolve_format, etc.]
 
-        # === STRING HANDLING ===
-        if "stringType" in prop:
-            if value is None:
-                value = ""
-            if not isinstance(value, str):
-                raise ValueError(f"Field {field_name} must be string, got {type(value)}")
-            
-            encoded_str = pack_string(value, prop["stringType"])
-            # Strings are variable length → we cannot use struct.pack with format string
-            # So we collect raw bytes separately
-            data_values.append(encoded_str)  # Will be concatenated later
-            data_format += f'{len(encoded_str)}s'  # Dynamic format
-            i += 1
-            continue
+class PdrEncoder:
+    """Encodes YAML PDR files against one schema.
 
-        # === RANGE FIELD SUPPORT (same as before) ===
-        if field_name == "rangeFieldSupport":
-            range_support = compute_range_field_support(plain_data, schema)
-            plain_data["rangeFieldSupport"] = range_support
-            fmt = prop["binaryFormat"]
-            data_format += fmt
-            data_values.append(range_support)
-            i += 1
-            # Append actual range fields
-            for range_field in binary_order[i:]:
-                if range_field in plain_data:
-                    rprop = properties[range_field]
-                    rfmt = resolve_format(range_field, plain_data, rprop)
-                    data_format += rfmt
-                    data_values.append(plain_data[range_field])
-            break
+    The schema parse, validator compilation and field plan are paid once in
+    __init__ (via the shared schema cache); encode() then costs only the YAML
+    parse plus packing, so a batch of files against the same schema amortizes
+    all schema work.
+    """
 
-        # === NORMAL FIELD ===
-        fmt = resolve_format(field_name, plain_data, prop)
-        data_format += fmt
-        data_values.append(value)
-        i += 1
-
-    # Pack everything (handling mixed fixed + variable strings)
-    packed_parts = []
-    val_idx = 0
-    for part in data_format[1:]:  # Skip initial '<'
-        if part.endswith('s'):
-            size = int(part[:-1])
-            packed_parts.append(data_values[val_idx][:size])
-            val_idx += 1
-        else:
-            # Fixed size field
-            packed_parts.append(struct.pack('<' + part, data_values[val_idx]))
-            val_idx += 1
+    def __init__(self, schema_path):
+        self.schema_path = schema_path
+        self.schema, self.validator, self.plan = _load_schema(schema_path)
+
+    def _pack(self, yaml_path, validate=True):
+        """Parse, validate and pack one YAML file; return the raw bytes."""
+        schema, plan = self.schema, self.plan
+        with open(yaml_path, 'r') as f:
+            data = yaml.load(f.read(), Loader=_YamlLoader)
+
+        plain_data = strip_comments(data)
+        plain_data = replace_tbd_and_defaults(plain_data, schema)
+
+        # Callers that already validated (e.g. the docs directive) or that
+        # encode known-good generated inputs can skip the validation pass,
+        # which often dominates per-file cost
+        if validate:
+            try:
+                self.validator(plain_data)
+            except _VALIDATION_ERRORS as e:
+                raise ValueError(f"Validation failed for {yaml_path}: {e}")
+
+        # Segments in binary order: (Struct, values) runs of fixed fields and
+        # (offset, length) spans of string data staged in one backing bytearray.
+        # Sizes are known before packing, so everything is written in place into
+        # one preallocated buffer below.
+        segments = []
+        staging = bytearray()   # all encoded strings, back to back
+        fixed_fmt = []   # struct format chars of the current fixed-field run
+        fixed_vals = []
+
+        def flush_fixed():
+            if fixed_fmt:
+                segments.append((_get_struct('<' + ''.join(fixed_fmt)), tuple(fixed_vals)))
+                del fixed_fmt[:]
+                del fixed_vals[:]
+
+        for field_name, kind, payload in plan:
+            # === STRING HANDLING ===
+            if kind == _KIND_STRING:
+                value = plain_data.get(field_name)
+                if value is None:
+                    value = ""
+                if not isinstance(value, str):
+                    raise ValueError(f"Field {field_name} must be string, got {type(value)}")
+
+                flush_fixed()
+                start = len(staging)
+                n = pack_string_into(staging, value, payload)
+                segments.append((start, n))
+
+            # === RANGE FIELD SUPPORT (same as before) ===
+            elif kind == _KIND_RANGE:
+                fmt_char, tail = payload
+                range_support = compute_range_field_support(plain_data, schema)
+                plain_data["rangeFieldSupport"] = range_support
+                fixed_fmt.append(fmt_char)
+                fixed_vals.append(range_support)
+                # Append actual range fields
+                for range_field, rprop in tail:
+                    if range_field in plain_data:
+                        fixed_fmt.append(resolve_format(range_field, plain_data, rprop))
+                        fixed_vals.append(plain_data[range_field])
+
+            # === NORMAL FIELD ===
+            else:
+                fixed_fmt.append(resolve_format(field_name, plain_data, payload))
+                fixed_vals.append(plain_data.get(field_name))
+
+        flush_fixed()
+        data_length = 0
+        for first, second in segments:
+            data_length += second if isinstance(first, int) else first.size
+
+        # Update header
+        plain_data["pdrHeader"]["dataLength"] = data_length
+
+        # One allocation for header + body; fixed runs are written in place with
+        # pack_into and strings spliced in, instead of one bytes object per field
+        # plus a join.
+        buf = bytearray(_HDR_STRUCT.size + data_length)
+        _HDR_STRUCT.pack_into(buf, 0,
+            plain_data["pdrHeader"].get("recordHandle", 0),
+            plain_data["pdrHeader"].get("PDRHeaderVersion", 1),
+            plain_data["pdrHeader"].get("PDRType", 0),
+            plain_data["pdrHeader"].get("recordChangeNumber", 0),
+            data_length
+        )
+        off = _HDR_STRUCT.size
+        staged = memoryview(staging)
+        for first, second in segments:
+            if isinstance(first, int):
+                buf[off:off + second] = staged[first:first + second]
+                off += second
+            else:
+                first.pack_into(buf, off, *second)
+                off += first.size
+
+        return bytes(buf)
+
+    def encode_to(self, out, yaml_path, array_name='pdr_data', validate=True):
+        """Stream the C array text for yaml_path into the file-like out.
+
+        The packed bytes are rendered and written in fixed-size chunks, so
+        nothing larger than one chunk of hex text is ever held in memory —
+        useful when a batch run appends many arrays to one output file.
+        """
+        full_packed = self._pack(yaml_path, validate)
+        out.write(f'const uint8_t {array_name}[] = {{ ')
+        for i in range(0, len(full_packed), _HEX_CHUNK):
+            if i:
+                out.write(', ')
+            out.write(_render_hex(full_packed[i:i + _HEX_CHUNK]))
+        out.write(' };')
 
-    packed_data = b''.join(packed_parts)
-    data_length = len(packed_data)
+    def encode(self, yaml_path, array_name='pdr_data', validate=True):
+        buf = io.StringIO()
+        self.encode_to(buf, yaml_path, array_name, validate)
+        return buf.getvalue()
 
-    # Update header
-    plain_data["pdrHeader"]["dataLength"] = data_length
+# Bytes rendered per write in encode_to
+_HEX_CHUNK = 4096
 
-    # Pack header (always fixed)
-    header_format = '<IBBHH'
-    packed_header = struct.pack(header_format,
-        plain_data["pdrHeader"].get("recordHandle", 0),
-        plain_data["pdrHeader"].get("PDRHeaderVersion", 1),
-        plain_data["pdrHeader"].get("PDRType", 0),
-        plain_data["pdrHeader"].get("recordChangeNumber", 0),
-        data_length
-    )
+def _render_hex(data):
+    """Render bytes as comma-separated 0xNN tokens."""
+    if _hex_tokens is not None and len(data) >= _NUMBA_HEX_THRESHOLD:
+        arr = np.frombuffer(data, dtype=np.uint8)
+        out = np.empty(arr.size * 6, dtype=np.uint8)
+        _hex_tokens(arr, _HEX_CHARS, out)
+        return out[:-2].tobytes().decode('ascii')  # drop trailing ', '
+    if np is not None and len(data) >= _NUMPY_HEX_THRESHOLD:
+        # One gather through the lookup table, one join
+        return ', '.join(_HEX_LUT[np.frombuffer(data, dtype=np.uint8)].tolist())
+    # One C-level hex() pass over the whole buffer, then split into byte
+    # pairs; no per-byte Python format call.
+    hx = data.hex().upper()
+    return '0x' + ', 0x'.join(hx[i:i + 2] for i in range(0, len(hx), 2)) if hx else ''
 
-    full_packed = packed_header + packed_data
+def generate_c_array(schema_path, yaml_path, array_name='pdr_data', validate=True):
+    # Thin shim; the shared schema cache makes throwaway encoders cheap
+    return PdrEncoder(schema_path).encode(yaml_path, array_name, validate)
 
-    hex_bytes = ', '.join(f'0x{b:02X}' for b in full_packed)
-    return f'const uint8_t {array_name}[] = {{ {hex_bytes} }};'
+def generate_c_array_to(out, schema_path, yaml_path, array_name='pdr_data', validate=True):
+    PdrEncoder(schema_path).encode_to(out, yaml_path, array_name, validate)
 
-# ... [keep the multi-file main block from previous version]
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != '--no-validate']
+    validate = len(args) == len(sys.argv) - 1
+    if len(args) < 2:
+        print("Usage: python code.py [--no-validate] <schema.json> <pdr.yaml> [<pdr.yaml> ...]")
+        sys.exit(1)
+    encoder = PdrEncoder(args[0])
+    for yaml_path in args[1:]:
+        name = os.path.splitext(os.path.basename(yaml_path))[0]
+        print(encoder.encode(yaml_path, name, validate=validate))
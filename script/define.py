@@ -1,6 +1,8 @@
 # PDR Type Mappings
 # Defines the field names and their data types for each PDR type
 
+import struct
+
 PDR_TYPES = {
     1: {  # Terminus Locator PDR
         "recordHandle": "uint32",
@@ -270,7 +272,45 @@ PDR_TYPES = {
     }
 }
 
-from pdr_type_mappings import PDR_TYPES
+# Struct format char per type name
+TYPE_TO_FMT = {
+    "uint8": "B", "int8": "b", "sint8": "b",
+    "uint16": "H", "sint16": "h",
+    "uint32": "I", "sint32": "i",
+    "uint64": "Q", "sint64": "q",
+    "real32": "f",
+}
+
+def _compile_pdr_types():
+    """Build the SoA view of PDR_TYPES: one entry per PDR type holding the
+    numeric field names, a precompiled little-endian Struct covering them in
+    declaration order, and the string field names separately. Consumers pack
+    with one Struct call instead of iterating the dict and resolving each
+    type name per record.
+    """
+    compiled = {}
+    for pdr_type, fields in PDR_TYPES.items():
+        names = []
+        fmt = ['<']
+        strings = []
+
+        def walk(field_map):
+            # Nested structures contribute their leaves in declaration order
+            for name, field_type in field_map.items():
+                if isinstance(field_type, dict):
+                    walk(field_type)
+                elif field_type.startswith('str'):
+                    strings.append(name)
+                else:
+                    names.append(name)
+                    fmt.append(TYPE_TO_FMT[field_type])
+
+        walk(fields)
+        compiled[pdr_type] = (tuple(names), struct.Struct(''.join(fmt)), tuple(strings))
+    return compiled
+
+# (field_names, Struct, string_field_names) per PDR type, built once at import
+COMPILED_PDR = _compile_pdr_types()
 
 # Example usage
 def print_pdr_types(pdr_type):
@@ -1,10 +1,104 @@
+import os
+import re
 import yaml
 import json
-from jsonschema import validate, ValidationError
+
+try:
+    # libyaml-backed parser; large speedup over the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson parses straight from bytes, several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_read(path):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+
+try:
+    # Compiles each schema to a dedicated validation function; much faster
+    # than generic jsonschema dispatch for per-directive validation
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
 from docutils import nodes
 from docutils.parsers.rst import Directive
+from docutils.statemachine import StringList
 from sphinx.util.docutils import SphinxDirective
 
+# Parsed schemas and their compiled validators, keyed by (path, mtime_ns).
+# Every directive invocation pointing at the same schema reuses one compiled
+# validator instead of recompiling it from scratch.
+_SCHEMA_CACHE = {}
+
+def _load_schema(schema_path):
+    """Return (schema, validate, order_map), cached on path and mtime.
+
+    validate is a fastjsonschema-compiled function when that package is
+    available, otherwise the .validate method of a prebuilt jsonschema
+    validator. order_map maps each binaryOrder field name to its index.
+    """
+    key = (schema_path, os.stat(schema_path).st_mtime_ns)
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is None:
+        schema = _json_read(schema_path)
+        if fastjsonschema is not None:
+            validate = fastjsonschema.compile(schema)
+        else:
+            validate = validator_for(schema)(schema).validate
+        order_map = {k: i for i, k in enumerate(schema.get('binaryOrder', []))}
+        cached = _SCHEMA_CACHE[key] = (schema, validate, order_map)
+    return cached
+
+_VALIDATION_ERRORS = (ValidationError,)
+if fastjsonschema is not None:
+    _VALIDATION_ERRORS += (fastjsonschema.JsonSchemaException,)
+
+# Resolved (field_type, fallback_comment) per schema node, keyed by the node's
+# id plus the typeResolver/formatResolver dependency values. The displayed
+# type depends only on those, so repeated fields — and repeat builds against
+# the same cached schema — skip the resolver chain and f-string work. Schema
+# dicts live for the process in _SCHEMA_CACHE, so their ids stay valid.
+_RESOLVE_CACHE = {}
+
+# Shared default for schema lookups that miss (data keys the schema doesn't
+# describe). It must be this one module-level dict, not a fresh {} per miss:
+# a temporary would be garbage-collected and CPython could hand its address
+# to a real schema node later, making the id-keyed _RESOLVE_CACHE serve a
+# stale entry for the wrong field.
+_EMPTY = {}
+
+# dependsOn path string -> pre-split tuple of parts
+_PATH_PARTS = {}
+
+_MISSING = object()
+
+# Comments containing any of these need real RST parsing; everything else can
+# go straight into a paragraph node.
+_RST_HINT = re.compile(r'[`*_:|]|^\s*\.\.')
+
+def get_nested_value(d, path):
+    """Get a nested value by dot-notation path, splitting each path once."""
+    parts = _PATH_PARTS.get(path)
+    if parts is None:
+        parts = _PATH_PARTS[path] = tuple(path.split('.'))
+    val = d
+    for part in parts:
+        if isinstance(val, dict):
+            val = val.get(part)
+        else:
+            return None
+    return val
+
 class PldmPdrTableDirective(SphinxDirective):
     required_arguments = 2  # YAML file path, JSON schema file path
     has_content = False
@@ -16,33 +110,53 @@ class PldmPdrTableDirective(SphinxDirective):
         # Load YAML data
         try:
             with open(yaml_path, 'r') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f.read(), Loader=_YamlLoader)
         except Exception as e:
             raise self.error(f"Failed to load YAML file '{yaml_path}': {e}")
 
-        # Load JSON schema
+        # Load JSON schema (cached, with its compiled validator)
         try:
-            with open(schema_path, 'r') as f:
-                schema = json.load(f)
+            schema, validate, order_map = _load_schema(schema_path)
         except Exception as e:
             raise self.error(f"Failed to load JSON schema '{schema_path}': {e}")
 
-        # Strip comments and unwrap sub-dicts for validation
+        # Strip comments and unwrap sub-dicts for validation. Copy-on-write:
+        # a new dict/list is only built when a comment is actually dropped or
+        # a child changed, so untouched subtrees are returned as-is instead
+        # of being rebuilt node by node.
         def strip_comments(data):
             if isinstance(data, dict):
                 if 'value' in data and isinstance(data['value'], (int, float, str, bool, type(None))):
                     return data['value']  # Unwrap scalar values
-                return {k: strip_comments(v) for k, v in data.items() if k != 'comment'}
+                out = data
+                for k, v in data.items():
+                    if k == 'comment':
+                        if out is data:
+                            out = {ck: cv for ck, cv in data.items() if ck != 'comment'}
+                        continue
+                    nv = strip_comments(v)
+                    if nv is not v:
+                        if out is data:
+                            out = {ck: cv for ck, cv in data.items() if ck != 'comment'}
+                        out[k] = nv
+                return out
             elif isinstance(data, list):
-                return [strip_comments(item) for item in data]
+                out = data
+                for i, item in enumerate(data):
+                    nv = strip_comments(item)
+                    if nv is not item:
+                        if out is data:
+                            out = list(data)
+                        out[i] = nv
+                return out
             return data
 
         plain_data = strip_comments(data)
 
         # Validate plain_data against schema
         try:
-            validate(instance=plain_data, schema=schema)
-        except ValidationError as e:
+            validate(plain_data)
+        except _VALIDATION_ERRORS as e:
             raise self.error(f"Validation failed for '{yaml_path}' against '{schema_path}': {e}")
 
         # Check conditionals
@@ -54,7 +168,7 @@ class PldmPdrTableDirective(SphinxDirective):
                     bit = key_schema['conditional'].get('bit')
                     if group is None or bit is None:
                         continue
-                    dep_value = self.get_nested_value(dat, group)  # Assuming group is at root; adjust if nested
+                    dep_value = get_nested_value(dat, group)  # Assuming group is at root; adjust if nested
                     if dep_value is None:
                         raise self.error(f"Missing dependency '{group}' for conditional field '{full_key}'")
                     expected_present = (dep_value & (1 << bit)) != 0
@@ -70,26 +184,69 @@ class PldmPdrTableDirective(SphinxDirective):
 
         check_conditionals(schema, plain_data)
 
-        # Helper to get nested value by dot-notation path
-        def get_nested_value(d, path):
-            parts = path.split('.')
-            val = d
-            for part in parts:
-                if isinstance(val, dict):
-                    val = val.get(part)
-                else:
-                    return None
-            return val
+        # Sibling fields often share a dependsOn path, so resolved dependency
+        # values are memoized for the lifetime of this run
+        dep_cache = {}
+
+        def dep_value_of(path):
+            v = dep_cache.get(path, _MISSING)
+            if v is _MISSING:
+                v = dep_cache[path] = get_nested_value(plain_data, path)
+            return v
 
-        # Flatten the data into table rows
-        rows = []
+        # Flatten the data into table rows. With a binaryOrder map each row is
+        # dropped straight into its order bucket (lists, so duplicate field
+        # names keep their relative order), which replaces the O(N log N)
+        # post-sort with O(N) placement. Header subfields and other fields not
+        # in binaryOrder land in extras and come first, as the old stable sort
+        # on key -1 arranged.
+        extras = []
+        ordered = [[] for _ in range(len(order_map))]
+
+        def emit(key, row):
+            if order_map:
+                idx = order_map.get(key, -1)
+                (ordered[idx] if idx >= 0 else extras).append(row)
+            else:
+                extras.append(row)
+
+        def _frame(node, pkey, sch):
+            if isinstance(node, dict):
+                return (iter(node.items()), pkey, sch, True)
+            return (enumerate(node), pkey, sch, False)
 
         def flatten(data, parent_key='', schema=schema):
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    full_key = f"{parent_key}.{key}" if parent_key else key
-                    # Get subschema for this key
-                    key_schema = schema.get('properties', {}).get(key, {})
+            # Explicit iterator stack: nested dicts/lists push a new frame and
+            # resume the parent afterwards, so rows come out in exactly the
+            # order the recursive walk produced, without a Python frame per
+            # nesting level.
+            stack = [_frame(data, parent_key, schema)]
+            while stack:
+                it, pkey, sch, is_dict = stack[-1]
+                try:
+                    key, value = next(it)
+                except StopIteration:
+                    stack.pop()
+                    continue
+                if not is_dict:
+                    # List item: recurse into containers, scalars have no row
+                    if isinstance(value, (dict, list)):
+                        stack.append(_frame(value, f"{pkey}[{key}]", sch.get('items', _EMPTY)))
+                    continue
+                full_key = f"{pkey}.{key}" if pkey else key
+                # Get subschema for this key
+                key_schema = sch.get('properties', _EMPTY).get(key, _EMPTY)
+                # The resolver chains depend only on the schema node and the
+                # dependsOn values, so fetch those first and consult the cache
+                resolver = key_schema.get('typeResolver')
+                type_dep = (dep_value_of(resolver['dependsOn'])
+                            if resolver and resolver.get('dependsOn') else None)
+                resolver = key_schema.get('formatResolver')
+                fmt_dep = (dep_value_of(resolver['dependsOn'])
+                           if resolver and resolver.get('dependsOn') else None)
+                cache_key = (id(key_schema), type_dep, fmt_dep)
+                cached = _RESOLVE_CACHE.get(cache_key)
+                if cached is None:
                     # Get type: handle anyOf/oneOf specially
                     if 'anyOf' in key_schema or 'oneOf' in key_schema:
                         variant_key = 'anyOf' if 'anyOf' in key_schema else 'oneOf'
@@ -100,64 +257,44 @@ class PldmPdrTableDirective(SphinxDirective):
                         if isinstance(field_type, list):
                             field_type = '/'.join(field_type)
                     # Resolve type if typeResolver defined
-                    if 'typeResolver' in key_schema:
-                        resolver = key_schema['typeResolver']
-                        dep_path = resolver.get('dependsOn')
-                        if dep_path:
-                            dep_value = get_nested_value(plain_data, dep_path)
-                            if dep_value is not None:
-                                str_dep_value = str(dep_value)  # Mapping keys are strings
-                                mapped_type = resolver.get('mapping', {}).get(str_dep_value)
-                                if mapped_type:
-                                    field_type = mapped_type
+                    if type_dep is not None:
+                        # Mapping keys are strings
+                        mapped_type = key_schema['typeResolver'].get('mapping', {}).get(str(type_dep))
+                        if mapped_type:
+                            field_type = mapped_type
                     # Resolve format (binaryFormat or formatResolver)
                     if 'formatResolver' in key_schema:
-                        resolver = key_schema['formatResolver']
-                        dep_path = resolver.get('dependsOn')
-                        if dep_path:
-                            dep_value = get_nested_value(plain_data, dep_path)
-                            if dep_value is not None:
-                                str_dep_value = str(dep_value)
-                                resolved_format = resolver.get('mapping', {}).get(str_dep_value)
+                        resolved_format = None
+                        if fmt_dep is not None:
+                            resolved_format = key_schema['formatResolver'].get('mapping', {}).get(str(fmt_dep))
                     else:
                         resolved_format = key_schema.get('binaryFormat', 'unknown')
                     if resolved_format and resolved_format != 'unknown':
                         field_type = f"{field_type} [{resolved_format}]"
-                    # Get fallback description
-                    fallback_comment = key_schema.get('description', '')
-                    # Handle sub-dict structure
-                    if isinstance(value, dict) and 'value' in value:
-                        comment = value.get('comment', fallback_comment)  # Fallback if missing/empty
-                        if comment is None or comment == '':
-                            comment = fallback_comment
-                        rows.append([field_type, key, str(value['value']), comment])
-                    # Handle direct scalar values (no sub-dict)
-                    elif not isinstance(value, (dict, list)):
-                        rows.append([field_type, key, str(value), fallback_comment])
-                    else:
-                        # Recurse for nested dicts/lists
-                        subschema = key_schema
-                        flatten(value, full_key, subschema)
-            elif isinstance(data, list):
-                for i, item in enumerate(data):
-                    full_key = f"{parent_key}[{i}]"
-                    # Assume array items have a schema under 'items'
-                    subschema = schema.get('items', {})
-                    flatten(item, full_key, subschema)
+                    cached = _RESOLVE_CACHE[cache_key] = (field_type, key_schema.get('description', ''))
+                field_type, fallback_comment = cached
+                # Handle sub-dict structure
+                if isinstance(value, dict) and 'value' in value:
+                    comment = value.get('comment', fallback_comment)  # Fallback if missing/empty
+                    if comment is None or comment == '':
+                        comment = fallback_comment
+                    emit(key, [field_type, key, str(value['value']), comment])
+                # Handle direct scalar values (no sub-dict)
+                elif not isinstance(value, (dict, list)):
+                    emit(key, [field_type, key, str(value), fallback_comment])
+                else:
+                    # Descend into nested dicts/lists
+                    stack.append(_frame(value, full_key, key_schema))
 
         flatten(data)
 
+        rows = extras
+        for bucket in ordered:
+            rows.extend(bucket)
+
         if not rows:
             raise self.error("No data found to generate table.")
 
-        # Sort rows if binaryOrder is defined (header fields first, then body in order)
-        if 'binaryOrder' in schema:
-            order_map = {k: i for i, k in enumerate(schema['binaryOrder'])}
-            def sort_key(row):
-                field = row[1]  # Field Name
-                return order_map.get(field, -1)  # -1 for non-body (e.g., pdrHeader subfields)
-            rows.sort(key=sort_key)
-
         # Generate RST table
         table = nodes.table()
         tgroup = nodes.tgroup(cols=4)
@@ -181,9 +318,9 @@ class PldmPdrTableDirective(SphinxDirective):
             row = nodes.row()
             for i, cell in enumerate(row_data):
                 entry = nodes.entry()
-                if i == 3:  # Comment column (index 3)
+                if i == 3 and cell and _RST_HINT.search(cell):  # Comment column (index 3)
                     # Parse comment as RST (handles long text, links, directives)
-                    self.state.nested_parse(cell.splitlines(), 0, entry)
+                    self.state.nested_parse(StringList(cell.splitlines()), 0, entry)
                 else:
                     # Other columns as plain text
                     entry += nodes.paragraph(text=cell)
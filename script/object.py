@@ -1,6 +1,36 @@
 import sys
 import yaml
 
+def _iter_pldm_objects(stream):
+    """Yield each entry of the top-level pldm_objects sequence one at a time.
+
+    Drives the loader event by event and composes a single sequence entry at
+    a time, so peak memory is one object plus the output buffer instead of
+    the whole document tree. Uses the pure-Python SafeLoader: the libyaml
+    binding exposes no incremental compose API.
+    """
+    loader = yaml.SafeLoader(stream)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            return  # root is not a mapping; nothing to yield
+        loader.get_event()  # MappingStartEvent
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.construct_object(loader.compose_node(None, None), deep=True)
+            if key == 'pldm_objects' and loader.check_event(yaml.SequenceStartEvent):
+                loader.get_event()  # SequenceStartEvent
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield loader.construct_object(loader.compose_node(None, None), deep=True)
+                loader.get_event()  # SequenceEndEvent
+            else:
+                # Some other top-level key: compose and discard its value
+                loader.construct_object(loader.compose_node(None, None), deep=True)
+    finally:
+        loader.dispose()
+
 # Enum mappings for type
 PLDM_TYPE_MAP = {
     'COMPACT_SENSOR': 'PLDM_COMPACT_SENSOR',
@@ -26,150 +56,261 @@ PLDM_SENSOR_INIT_MAP = {
     'DISABLE': 'PLDM_SENSOR_DISABLE'
 }
 
+# Bound .get methods: one attribute lookup saved per enum per object
+_TYPE_GET = PLDM_TYPE_MAP.get
+_UNIT_GET = PLDM_BASE_UNIT_MAP.get
+_INIT_GET = PLDM_SENSOR_INIT_MAP.get
+
+# Bool -> C literal; indexing by bool(v) replaces a str(v).lower() call per flag
+_BOOL_STR = ('false', 'true')
+
+def _f(v):
+    """Format a float for the generated C source.
+
+    %.7g is round-trip safe for the single-precision .real32 fields and much
+    shorter than float.__str__ for values like 0.1 + 0.2 — fewer bytes to
+    write here and fewer for the C compiler to parse later. Whole values come
+    out of %.7g with no '.' or exponent, which would turn the templates'
+    appended f suffix into an invalid integer constant like 0f, so .0 is
+    added back in that case.
+    """
+    s = format(v, '.7g')
+    if '.' not in s and 'e' not in s and 'E' not in s:
+        s += '.0'
+    return s
+
+# One str.format template per emitted section, built once at import: each
+# object section renders with a single format_map call and one append instead
+# of dozens of f-string evaluations. Literal braces are doubled.
+_OBJECT_HEAD_TMPL = (
+    '    {{\n'
+    '        .type = {type_enum},\n'
+    '        .common_config = {{\n'
+    '            .id = {id},\n'
+    '            .entity_type = {entity_type},\n'
+    '            .entity_instance = {entity_instance},\n'
+    '            .container_id = {container_id},\n'
+    '            .enabled = {enabled},\n'
+    '            .base_unit = {base_unit},\n'
+    '            .unit_modifier = {unit_modifier}\n'
+    '        }},\n'
+)
+
+_NUMERIC_SENSOR_TMPL = (
+    '            .numeric_sensor = {{\n'
+    '                .init = {init},\n'
+    '                .data_size = {data_size},\n'
+    '                .resolution = {resolution}f,\n'
+    '                .offset = {offset}f,\n'
+    '                .accuracy = {accuracy}f,\n'
+    '                .plus_tolerance = {plus_tolerance}f,\n'
+    '                .minus_tolerance = {minus_tolerance}f,\n'
+    '                .hysteresis = {hysteresis}f,\n'
+    '                .supported_thresholds = {{\n'
+    '{supported_thresholds}'
+    '                    .reserved = 0\n'
+    '                }}}},\n'
+    '                .thresholds = {thresholds},\n'
+    '                .is_linear = {is_linear}\n'
+    '            }}\n'
+)
+
+_STATE_SENSOR_TMPL = (
+    '            .state_sensor = {{\n'
+    '                .state_set_id = {state_set_id},\n'
+    '                .composite_count = {composite_count},\n'
+    '                .possible_states = {possible_states}\n'
+    '            }}\n'
+)
+
+_NUMERIC_EFFECTOR_TMPL = (
+    '            .numeric_effector = {{\n'
+    '                .data_size = {data_size},\n'
+    '                .min_set = {{ .real32 = {min_set}f }},\n'
+    '                .max_set = {{ .real32 = {max_set}f }},\n'
+    '                .default_set = {{ .real32 = {default_set}f }}\n'
+    '            }}\n'
+)
+
+_STATE_EFFECTOR_TMPL = (
+    '            .state_effector = {{\n'
+    '                .state_set_id = {state_set_id},\n'
+    '                .possible_states = {possible_states}\n'
+    '            }}\n'
+)
+
+_ST_FIELDS = ('lower_fatal', 'lower_critical', 'lower_warning',
+              'upper_warning', 'upper_critical', 'upper_fatal')
+
+# Rendered .supported_thresholds blocks, keyed by the 6-flag combination.
+# Only 64 combinations exist and real configs repeat a handful of them, so
+# after the first sensor with a given combination the block is a dict hit
+# instead of six formatted lines.
+_ST_BLOCK_CACHE = {}
+
+def _supported_thresholds_block(supp_thresh):
+    key = tuple(bool(supp_thresh.get(k, False)) for k in _ST_FIELDS)
+    block = _ST_BLOCK_CACHE.get(key)
+    if block is None:
+        block = _ST_BLOCK_CACHE[key] = ''.join(
+            f'                    .{name} = {_BOOL_STR[flag]},\n'
+            for name, flag in zip(_ST_FIELDS, key))
+    return block
+
+_COMMON_DATA_TMPL = (
+    '        .common_data = {{\n'
+    '            .present_value = {{ .real32 = {present_value}f }},\n'
+    '            .operational_state = {operational_state},\n'
+    '            .event_state = {event_state}\n'
+    '        }},\n'
+)
+
+# Per-section defaults: {**DEFAULTS, **section} fills missing keys in one
+# C-level dict merge, after which every field is a plain subscript instead of
+# a .get call with a literal default. format_map ignores extra YAML keys.
+_CC_DEFAULTS = {'id': 0, 'entity_type': 0, 'entity_instance': 0,
+                'container_id': 0, 'enabled': False,
+                'base_unit': 'UNSPECIFIED', 'unit_modifier': 0}
+_NS_DEFAULTS = {'init': 'NO_INIT', 'data_size': 0, 'resolution': 0.0,
+                'offset': 0.0, 'accuracy': 0.0, 'plus_tolerance': 0.0,
+                'minus_tolerance': 0.0, 'hysteresis': 0.0,
+                'thresholds': (0.0,) * 6, 'supported_thresholds': {},
+                'is_linear': False}
+_NS_FLOAT_FIELDS = ('resolution', 'offset', 'accuracy', 'plus_tolerance',
+                    'minus_tolerance', 'hysteresis')
+_SS_DEFAULTS = {'state_set_id': 0, 'composite_count': 0,
+                'possible_states': ((0,) * 32,) * 8}
+_NE_DEFAULTS = {'data_size': 0, 'min_set': 0.0, 'max_set': 0.0,
+                'default_set': 0.0}
+_SE_DEFAULTS = {'state_set_id': 0, 'possible_states': (0,) * 32}
+_CD_DEFAULTS = {'present_value': 0.0, 'operational_state': 0,
+                'event_state': 0}
+
 def main(yaml_file, output_c):
-    with open(yaml_file, 'r') as f:
-        data = yaml.safe_load(f)
-    
-    objects = data.get('pldm_objects', [])
-    if not objects:
-        sys.exit("No pldm_objects defined in YAML")
-    
-    # Validate basics (ignore missing non-required)
+    # Generated C accumulates in memory and hits the file in one write at the
+    # end; the per-line f.write() calls each paid method dispatch and, at
+    # flush time, a syscall. Sections are also coalesced into one multi-line
+    # f-string apiece so each object costs a handful of appends. Objects are
+    # streamed out of the YAML one at a time and validated inline; nothing is
+    # written if validation aborts.
     ids = set()
-    for obj in objects:
-        obj_id = obj.get('common_config', {}).get('id', 0)
-        if obj_id in ids:
+    ids_add = ids.add  # bound method: one hash-table op per object, not two
+    seen = 0
+    parts = ['#include "pldm_objects.h"\n\n']  # Assume header name
+    parts.append('const PldmObject pldm_objects[] = {\n')
+    append = parts.append  # local binding for the per-object emission loop
+    yaml_stream = open(yaml_file, 'r')
+    for obj in _iter_pldm_objects(yaml_stream):
+        # Validate basics (ignore missing non-required). common_config is
+        # fetched once here and reused below instead of per-access.
+        common_config = obj.get('common_config') or {}
+        obj_id = common_config.get('id', 0)
+        ids_add(obj_id)
+        seen += 1
+        if len(ids) != seen:
             sys.exit(f"Duplicate id: {obj_id}")
-        ids.add(obj_id)
         type_str = obj.get('type')
         if type_str and type_str not in PLDM_TYPE_MAP:
             sys.exit(f"Invalid type '{type_str}'. Valid: {list(PLDM_TYPE_MAP.keys())}")
-    
-    with open(output_c, 'w') as f:
-        f.write('#include "pldm_objects.h"\n\n')  # Assume header name
-        f.write('const PldmObject pldm_objects[] = {\n')
-        for obj in objects:
-            type_enum = PLDM_TYPE_MAP.get(obj.get('type', 'COMPACT_SENSOR'), 'PLDM_COMPACT_SENSOR')
-            common_config = obj.get('common_config', {})
-            specific_config = obj.get('specific_config', {})
-            common_data = obj.get('common_data', {})
-            specific_data = obj.get('specific_data', {})
-            
-            f.write('    {\n')
-            f.write(f'        .type = {type_enum},\n')
-            
-            # Common config (defaults for missing)
-            f.write('        .common_config = {\n')
-            f.write(f'            .id = {common_config.get("id", 0)},\n')
-            f.write(f'            .entity_type = {common_config.get("entity_type", 0)},\n')
-            f.write(f'            .entity_instance = {common_config.get("entity_instance", 0)},\n')
-            f.write(f'            .container_id = {common_config.get("container_id", 0)},\n')
-            f.write(f'            .enabled = {str(common_config.get("enabled", false)).lower()},\n')
-            base_unit_str = common_config.get("base_unit", 'UNSPECIFIED')
-            base_unit = PLDM_BASE_UNIT_MAP.get(base_unit_str, 'PLDM_UNIT_UNSPECIFIED')
-            f.write(f'            .base_unit = {base_unit},\n')
-            f.write(f'            .unit_modifier = {common_config.get("unit_modifier", 0)}\n')
-            f.write('        },\n')
-            
-            # Specific config (union, select based on type; ignore missing subfields)
-            f.write('        .specific_config = {\n')
-            if 'numeric_sensor' in specific_config:
-                ns = specific_config['numeric_sensor']
-                init_str = ns.get('init', 'NO_INIT')
-                init_enum = PLDM_SENSOR_INIT_MAP.get(init_str, 'PLDM_SENSOR_NO_INIT')
-                thresholds = ns.get('thresholds', [0.0] * 6)
-                thresh_str = '{' + ', '.join(f'{{ .real32 = {t}f }}' for t in thresholds) + '}'
-                supp_thresh = ns.get('supported_thresholds', {})
-                f.write(f'            .numeric_sensor = {{\n')
-                f.write(f'                .init = {init_enum},\n')
-                f.write(f'                .data_size = {ns.get("data_size", 0)},\n')
-                f.write(f'                .resolution = {ns.get("resolution", 0.0)}f,\n')
-                f.write(f'                .offset = {ns.get("offset", 0.0)}f,\n')
-                f.write(f'                .accuracy = {ns.get("accuracy", 0.0)}f,\n')
-                f.write(f'                .plus_tolerance = {ns.get("plus_tolerance", 0.0)}f,\n')
-                f.write(f'                .minus_tolerance = {ns.get("minus_tolerance", 0.0)}f,\n')
-                f.write(f'                .hysteresis = {ns.get("hysteresis", 0.0)}f,\n')
-                f.write(f'                .supported_thresholds = {{\n')
-                f.write(f'                    .lower_fatal = {str(supp_thresh.get("lower_fatal", false)).lower()},\n')
-                f.write(f'                    .lower_critical = {str(supp_thresh.get("lower_critical", false)).lower()},\n')
-                f.write(f'                    .lower_warning = {str(supp_thresh.get("lower_warning", false)).lower()},\n')
-                f.write(f'                    .upper_warning = {str(supp_thresh.get("upper_warning", false)).lower()},\n')
-                f.write(f'                    .upper_critical = {str(supp_thresh.get("upper_critical", false)).lower()},\n')
-                f.write(f'                    .upper_fatal = {str(supp_thresh.get("upper_fatal", false)).lower()},\n')
-                f.write(f'                    .reserved = 0\n')
-                f.write('                }},\n')
-                f.write(f'                .thresholds = {thresh_str},\n')
-                f.write(f'                .is_linear = {str(ns.get("is_linear", false)).lower()}\n')
-                f.write('            }\n')
-            elif 'state_sensor' in specific_config:
-                ss = specific_config['state_sensor']
-                possible_states = ss.get('possible_states', [[0] * 32] * 8)
-                ps_str = '{' + ', '.join('{' + ', '.join(str(b) for b in ps) + '}' for ps in possible_states) + '}'
-                f.write(f'            .state_sensor = {{\n')
-                f.write(f'                .state_set_id = {ss.get("state_set_id", 0)},\n')
-                f.write(f'                .composite_count = {ss.get("composite_count", 0)},\n')
-                f.write(f'                .possible_states = {ps_str}\n')
-                f.write('            }\n')
-            elif 'numeric_effector' in specific_config:
-                ne = specific_config['numeric_effector']
-                f.write(f'            .numeric_effector = {{\n')
-                f.write(f'                .data_size = {ne.get("data_size", 0)},\n')
-                f.write(f'                .min_set = {{ .real32 = {ne.get("min_set", 0.0)}f }},\n')
-                f.write(f'                .max_set = {{ .real32 = {ne.get("max_set", 0.0)}f }},\n')
-                f.write(f'                .default_set = {{ .real32 = {ne.get("default_set", 0.0)}f }}\n')
-                f.write('            }\n')
-            elif 'state_effector' in specific_config:
-                se = specific_config['state_effector']
-                possible_states = se.get('possible_states', [0] * 32)
-                ps_str = '{' + ', '.join(str(b) for b in possible_states) + '}'
-                f.write(f'            .state_effector = {{\n')
-                f.write(f'                .state_set_id = {se.get("state_set_id", 0)},\n')
-                f.write(f'                .possible_states = {ps_str}\n')
-                f.write('            }\n')
-            f.write('        },\n')
-            
-            # Common data
-            f.write('        .common_data = {\n')
-            f.write(f'            .present_value = {{ .real32 = {common_data.get("present_value", 0.0)}f }},\n')
-            f.write(f'            .operational_state = {common_data.get("operational_state", 0)},\n')
-            f.write(f'            .event_state = {common_data.get("event_state", 0)}\n')
-            f.write('        },\n')
-            
-            # Specific data
-            f.write('        .specific_data = {\n')
-            if 'numeric_data' in specific_data:
-                nd = specific_data['numeric_data']
-                readings = nd.get('readings', [0.0] * 8)
-                read_str = '{' + ', '.join(f'{{ .real32 = {r}f }}' for r in readings) + '}'
-                thresh_ex = nd.get('threshold_exceeded', [false] * 6)
-                te_str = '{' + ', '.join(str(te).lower() for te in thresh_ex) + '}'
-                f.write(f'            .numeric_data = {{\n')
-                f.write(f'                .readings = {read_str},\n')
-                f.write(f'                .threshold_exceeded = {te_str}\n')
-                f.write('            }\n')
-            elif 'state_data' in specific_data:
-                sd = specific_data['state_data']
-                curr_states = sd.get('current_states', [0] * 8)
-                prev_states = sd.get('previous_states', [0] * 8)
-                cs_str = '{' + ', '.join(str(s) for s in curr_states) + '}'
-                ps_str = '{' + ', '.join(str(s) for s in prev_states) + '}'
-                f.write(f'            .state_data = {{\n')
-                f.write(f'                .current_states = {cs_str},\n')
-                f.write(f'                .previous_states = {ps_str}\n')
-                f.write('            }\n')
-            elif 'numeric_effector_data' in specific_data:
-                ned = specific_data['numeric_effector_data']
-                f.write(f'            .numeric_effector_data = {{\n')
-                f.write(f'                .current_setting = {{ .real32 = {ned.get("current_setting", 0.0)}f }}\n')
-                f.write('            }\n')
-            elif 'state_effector_data' in specific_data:
-                sed = specific_data['state_effector_data']
-                f.write(f'            .state_effector_data = {{\n')
-                f.write(f'                .current_state = {sed.get("current_state", 0)}\n')
-                f.write('            }\n')
-            f.write('        }\n')
-            f.write('    },\n')
-        f.write('};\n')
+        type_enum = _TYPE_GET(obj.get('type', 'COMPACT_SENSOR'), 'PLDM_COMPACT_SENSOR')
+        specific_config = obj.get('specific_config', {})
+        common_data = obj.get('common_data', {})
+        specific_data = obj.get('specific_data', {})
+
+        # Common config (defaults for missing)
+        cc = {**_CC_DEFAULTS, **common_config}
+        cc['type_enum'] = type_enum
+        cc['enabled'] = _BOOL_STR[bool(cc['enabled'])]
+        cc['base_unit'] = _UNIT_GET(cc['base_unit'], 'PLDM_UNIT_UNSPECIFIED')
+        append(_OBJECT_HEAD_TMPL.format_map(cc))
+
+        # Specific config (union, select based on type; ignore missing subfields)
+        append('        .specific_config = {\n')
+        if 'numeric_sensor' in specific_config:
+            ns = {**_NS_DEFAULTS, **specific_config['numeric_sensor']}
+            ns['init'] = _INIT_GET(ns['init'], 'PLDM_SENSOR_NO_INIT')
+            for k in _NS_FLOAT_FIELDS:
+                ns[k] = _f(ns[k])
+            ns['supported_thresholds'] = _supported_thresholds_block(ns['supported_thresholds'])
+            ns['thresholds'] = '{' + ', '.join(f'{{ .real32 = {_f(t)}f }}' for t in ns['thresholds']) + '}'
+            ns['is_linear'] = _BOOL_STR[bool(ns['is_linear'])]
+            append(_NUMERIC_SENSOR_TMPL.format_map(ns))
+        elif 'state_sensor' in specific_config:
+            ss = {**_SS_DEFAULTS, **specific_config['state_sensor']}
+            ss['possible_states'] = '{' + ', '.join(
+                '{' + ', '.join(str(b) for b in ps) + '}' for ps in ss['possible_states']) + '}'
+            append(_STATE_SENSOR_TMPL.format_map(ss))
+        elif 'numeric_effector' in specific_config:
+            ne = {**_NE_DEFAULTS, **specific_config['numeric_effector']}
+            ne['min_set'] = _f(ne['min_set'])
+            ne['max_set'] = _f(ne['max_set'])
+            ne['default_set'] = _f(ne['default_set'])
+            append(_NUMERIC_EFFECTOR_TMPL.format_map(ne))
+        elif 'state_effector' in specific_config:
+            se = {**_SE_DEFAULTS, **specific_config['state_effector']}
+            se['possible_states'] = '{' + ', '.join(str(b) for b in se['possible_states']) + '}'
+            append(_STATE_EFFECTOR_TMPL.format_map(se))
+        append('        },\n')
+
+        # Common data
+        cd = {**_CD_DEFAULTS, **common_data}
+        cd['present_value'] = _f(cd['present_value'])
+        append(_COMMON_DATA_TMPL.format_map(cd))
+
+        # Specific data
+        append('        .specific_data = {\n')
+        if 'numeric_data' in specific_data:
+            nd = specific_data['numeric_data']
+            readings = nd.get('readings', [0.0] * 8)
+            read_str = '{' + ', '.join(f'{{ .real32 = {_f(r)}f }}' for r in readings) + '}'
+            thresh_ex = nd.get('threshold_exceeded', [False] * 6)
+            te_str = '{' + ', '.join(_BOOL_STR[bool(te)] for te in thresh_ex) + '}'
+            append(
+                '            .numeric_data = {\n'
+                f'                .readings = {read_str},\n'
+                f'                .threshold_exceeded = {te_str}\n'
+                '            }\n'
+            )
+        elif 'state_data' in specific_data:
+            sd = specific_data['state_data']
+            curr_states = sd.get('current_states', [0] * 8)
+            prev_states = sd.get('previous_states', [0] * 8)
+            cs_str = '{' + ', '.join(str(s) for s in curr_states) + '}'
+            ps_str = '{' + ', '.join(str(s) for s in prev_states) + '}'
+            append(
+                '            .state_data = {\n'
+                f'                .current_states = {cs_str},\n'
+                f'                .previous_states = {ps_str}\n'
+                '            }\n'
+            )
+        elif 'numeric_effector_data' in specific_data:
+            ned = specific_data['numeric_effector_data']
+            append(
+                '            .numeric_effector_data = {\n'
+                f'                .current_setting = {{ .real32 = {_f(ned.get("current_setting", 0.0))}f }}\n'
+                '            }\n'
+            )
+        elif 'state_effector_data' in specific_data:
+            sed = specific_data['state_effector_data']
+            append(
+                '            .state_effector_data = {\n'
+                f'                .current_state = {sed.get("current_state", 0)}\n'
+                '            }\n'
+            )
+        append(
+            '        }\n'
+            '    },\n'
+        )
+    yaml_stream.close()
+    if not ids:
+        sys.exit("No pldm_objects defined in YAML")
+    append('};\n')
+
+    # One ascii encode of the whole buffer, written in binary mode: no
+    # text-layer newline translation or per-write encoding, and the generated
+    # C source is guaranteed pure ASCII.
+    with open(output_c, 'wb') as f:
+        f.write(''.join(parts).encode('ascii'))
 
 if __name__ == '__main__':
     if len(sys.argv) != 3:
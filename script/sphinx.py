@@ -1,10 +1,46 @@
+import functools
 import json
+import os
 import yaml
+
+try:
+    # libyaml-backed parser; large speedup over the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson parses straight from bytes, several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
 from docutils import nodes
 from sphinx.util import nested_parse_with_titles
 from sphinx.util.docutils import SphinxDirective
 from docutils.statemachine import ViewList
 
+# Cells containing any of these metacharacters may carry RST markup and need
+# real parsing; everything else — including the generated sensorID formula —
+# goes straight into a paragraph node. frozenset.isdisjoint scans the string
+# in C, cheaper per cell than a regex search, and directives/roles always
+# contain ':' so nothing slips past.
+_RST_META = frozenset('*`:|_[<')
+
+# N directives pointing at the same config parse it once; mtime in the key
+# invalidates on edit. lru_cache is atomic, so this stays parallel_read_safe.
+@functools.lru_cache(maxsize=32)
+def _load_json(path, mtime):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml(path, mtime):
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 class PDRTableDirective(SphinxDirective):
     """
     A Sphinx directive to create a table from JSON and YAML files.
@@ -20,10 +56,8 @@ class PDRTableDirective(SphinxDirective):
             return [self.error("Both 'json' and 'yaml' options are required.")]
 
         try:
-            with open(json_path, 'r') as f:
-                json_data = json.load(f)
-            with open(yaml_path, 'r') as f:
-                yaml_data = yaml.safe_load(f)
+            json_data = _load_json(json_path, os.stat(json_path).st_mtime)
+            yaml_data = _load_yaml(yaml_path, os.stat(yaml_path).st_mtime)
         except Exception as e:
             return [self.error(f"Error loading files: {e}")]
 
@@ -47,7 +81,10 @@ class PDRTableDirective(SphinxDirective):
 
     def extract_field_types(self, yaml_data):
         """Extract field types from YAML data."""
-        pdr_type_key = list(yaml_data.keys())[0]
+        if not yaml_data:
+            return {}
+        # First key without materialising the whole key list
+        pdr_type_key = next(iter(yaml_data))
         return yaml_data[pdr_type_key]
 
     def get_sensor_id_formula(self, sensor_ids):
@@ -55,13 +92,14 @@ class PDRTableDirective(SphinxDirective):
         if not sensor_ids:
             return "Varies across objects"
 
-        # Check for pattern "k * n"
-        n_values = list(range(1, len(sensor_ids) + 1))
-        k_values = [sid / n for sid, n in zip(sensor_ids, n_values)]
-        if all(k == k_values[0] for k in k_values):  # Consistent multiplier
-            k = k_values[0]
-            return f"{int(k)} * n, n from 1 to {len(sensor_ids)}"
-        return "Varies across objects"
+        # Check for pattern "k * n": one integer pass that aborts on the
+        # first mismatch — no float division, no intermediate k list, and no
+        # rounding surprises for ids that don't divide evenly
+        k = sensor_ids[0]
+        for n, sid in enumerate(sensor_ids, 1):
+            if sid != k * n:
+                return "Varies across objects"
+        return f"{k} * n, n from 1 to {len(sensor_ids)}"
 
     def generate_table_rows(self, pdr_data, field_types, value_formula):
         """Generate table rows from PDR data."""
@@ -87,13 +125,12 @@ class PDRTableDirective(SphinxDirective):
         tgroup += thead
         header_row = nodes.row()
         headers = ["Type", "PDR field", "PDR field value", "comment"]
+        # Headers are plain strings: a paragraph node suffices, no docutils
+        # state machine needed
         for header in headers:
             entry = nodes.entry()
+            entry += nodes.paragraph(text=header)
             header_row += entry
-            viewlist = ViewList([header], "<pdr_table>")
-            paragraph = nodes.paragraph()
-            nested_parse_with_titles(self.state, viewlist, paragraph)
-            entry += paragraph
         thead += header_row
 
         # Table body
@@ -101,13 +138,19 @@ class PDRTableDirective(SphinxDirective):
         tgroup += tbody
         for row_data in rows:
             row = nodes.row()
-            for cell in row_data:
+            for i, cell in enumerate(row_data):
                 entry = nodes.entry()
                 row += entry
-                viewlist = ViewList([str(cell)], "<pdr_table>")
-                paragraph = nodes.paragraph()
-                nested_parse_with_titles(self.state, viewlist, paragraph)
-                entry += paragraph
+                cell = str(cell)
+                if i == 3 and cell and not _RST_META.isdisjoint(cell):
+                    # Comment column: only pay for RST parsing when the text
+                    # can actually contain markup
+                    viewlist = ViewList([cell], "<pdr_table>")
+                    paragraph = nodes.paragraph()
+                    nested_parse_with_titles(self.state, viewlist, paragraph)
+                    entry += paragraph
+                else:
+                    entry += nodes.paragraph(text=cell)
             tbody += row
 
         return table
@@ -1,9 +1,23 @@
 from sphinx.util.docutils import SphinxDirective
 from docutils import nodes
 from docutils.statemachine import StringList
+import functools
 import json
+import os
 import yaml
 
+try:
+    # libyaml-backed parser; large speedup over the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # orjson parses straight from bytes, several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
 # Define PDR field types based on pdr_type
 PDR_TYPES = {
     2: {
@@ -25,14 +39,57 @@ PDR_TYPES = {
     }
 }
 
-def flatten_dict(d, parent_key='', sep='.'):
-    """Flatten a nested dictionary into (path, value) pairs."""
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            yield from flatten_dict(v, new_key, sep=sep)
+# N directives pointing at the same config parse it once; mtime in the key
+# invalidates on edit. lru_cache is atomic, so this stays parallel_read_safe.
+@functools.lru_cache(maxsize=32)
+def _load_json(path, mtime):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml(path, mtime):
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+# pdr_display keys follow the <field>_comment convention we generate; strip
+# the suffix once per file so row resolution indexes on the bare field name
+# instead of building and hashing an f"{field}_comment" string per row.
+@functools.lru_cache(maxsize=32)
+def _load_comments(path, mtime):
+    config = _load_yaml(path, mtime)
+    return {k[:-8]: v
+            for k, v in config.get("pdr_display", {}).items()
+            if k.endswith("_comment")}
+
+def flatten_dict(d):
+    """Flatten a nested dictionary into a list of (path, value) pairs.
+
+    Paths are tuples of keys, so callers index components directly instead
+    of re-splitting a joined string per row. Iterative: an explicit iterator
+    stack replaces the recursive generator, so no generator frame or
+    yield-from plumbing is created per nesting level, while rows keep the
+    exact in-place expansion order of the recursive version. PDR records
+    only use plain dicts, so the exact-type check skips isinstance's MRO
+    walk.
+    """
+    out = []
+    stack = [(iter(d.items()), ())]
+    while stack:
+        it, pfx = stack[-1]
+        try:
+            k, v = next(it)
+        except StopIteration:
+            stack.pop()
+            continue
+        nk = pfx + (k,)
+        if type(v) is dict:
+            stack.append((iter(v.items()), nk))
         else:
-            yield new_key, v
+            out.append((nk, v))
+    return out
 
 def get_type(type_map, path):
     """Retrieve the type for a field path from the type map."""
@@ -44,6 +101,21 @@ def get_type(type_map, path):
             return None
     return current if isinstance(current, str) else None
 
+# Repeated prefixes are the norm in PDR records, and incremental rebuilds
+# re-render the same handles; memoizing on (pdr_type, path) skips the
+# per-component dict walk. PDR_TYPES is a module constant, so keying on the
+# pdr_type rather than the map object itself can never go stale.
+@functools.lru_cache(maxsize=1024)
+def _get_type(pdr_type, path):
+    return get_type(PDR_TYPES.get(pdr_type, {}), path)
+
+# Fully-resolved row tuples (type, field, value, comment) keyed by input
+# paths, their mtimes, and the record handle. The same handle is often
+# referenced from several pages and again on incremental rebuilds; docutils
+# nodes can't be shared across parents, so the cache stops at this flat list
+# and only the cheap node construction runs on a hit.
+_rows_cache = {}
+
 class PdrTableDirective(SphinxDirective):
     """Custom Sphinx directive to generate a PDR table."""
     required_arguments = 3  # json_path, yaml_path, pdr_handle
@@ -52,25 +124,32 @@ class PdrTableDirective(SphinxDirective):
         json_path, yaml_path, pdr_handle = self.arguments
         pdr_handle = int(pdr_handle)
 
-        # Load JSON file
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-        records = data.get("terminus_locator", [])
-        record = next((r for r in records if r.get("record_handle") == pdr_handle), None)
-        if record is None:
-            raise ValueError(f"No record found with record_handle {pdr_handle}")
-
-        # Load YAML file
-        with open(yaml_path, 'r') as f:
-            config = yaml.safe_load(f)
-        comments = config.get("pdr_display", {})
-
-        # Get pdr_type and corresponding type map
-        pdr_type = record.get("pdr_type")
-        type_map = PDR_TYPES.get(pdr_type, {})
-
-        # Flatten the record into field paths and values
-        fields = list(flatten_dict(record))
+        json_mtime = os.stat(json_path).st_mtime
+        yaml_mtime = os.stat(yaml_path).st_mtime
+        cache_key = (json_path, json_mtime, yaml_path, yaml_mtime, pdr_handle)
+        rows = _rows_cache.get(cache_key)
+        if rows is None:
+            # Load JSON file
+            data = _load_json(json_path, json_mtime)
+            records = data.get("terminus_locator", [])
+            record = next((r for r in records if r.get("record_handle") == pdr_handle), None)
+            if record is None:
+                raise ValueError(f"No record found with record_handle {pdr_handle}")
+
+            # Load YAML comments, keyed by bare field name
+            comments = _load_comments(yaml_path, yaml_mtime)
+
+            # Get pdr_type; the type map is resolved inside the memoized lookup
+            pdr_type = record.get("pdr_type")
+
+            # Flatten the record and resolve each row down to plain strings
+            rows = []
+            for path, value in flatten_dict(record):
+                field_name = path[-1]
+                field_type = _get_type(pdr_type, path) or "unknown"
+                comment_text = comments.get(field_name, "")
+                rows.append((field_type, '.'.join(path), str(value), comment_text))
+            _rows_cache[cache_key] = rows
 
         # Create table structure
         table = nodes.table()
@@ -95,40 +174,24 @@ class PdrTableDirective(SphinxDirective):
         tbody = nodes.tbody()
         tgroup += tbody
 
-        for path, value in fields:
-            row = nodes.row()
-            path_list = path.split('.')
-            field_name = path_list[-1]
-
-            # Type column
-            field_type = get_type(type_map, path_list) or "unknown"
+        # Each entry goes into the row in one constructor call instead of
+        # four append cycles through docutils' child management
+        def _cell(text):
             entry = nodes.entry()
-            entry += nodes.paragraph(text=field_type)
-            row += entry
+            entry += nodes.paragraph(text=text)
+            return entry
 
-            # PDR Field column
-            entry = nodes.entry()
-            entry += nodes.paragraph(text=path)
-            row += entry
-
-            # Value column
-            entry = nodes.entry()
-            entry += nodes.paragraph(text=str(value))
-            row += entry
-
-            # Comment column (parsed as RST for rich text)
-            comment_key = f"{field_name}_comment"
-            comment_text = comments.get(comment_key, "")
-            entry = nodes.entry()
+        for field_type, field_path, value_text, comment_text in rows:
+            entries = [_cell(field_type), _cell(field_path),
+                       _cell(value_text), _cell(comment_text)]
             if comment_text:
+                # Comment column is parsed as RST for rich text
+                entry = nodes.entry()
                 temp_section = nodes.section()
                 self.state.nested_parse(StringList([comment_text]), 0, temp_section)
                 entry += temp_section.children
-            else:
-                entry += nodes.paragraph()
-            row += entry
-
-            tbody += row
+                entries[3] = entry
+            tbody += nodes.row('', *entries)
 
         return [table]
 